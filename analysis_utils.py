@@ -11,15 +11,17 @@ from __future__ import annotations
 import re
 import unicodedata
 from collections import Counter, defaultdict
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from itertools import chain
 from typing import Iterable, Dict, List, Tuple
 
 from whatsapp_parser import Message
 
 # A small set of common English stopwords for word frequency analysis.  For a
 # production system you might use nltk.corpus.stopwords instead.
-STOPWORDS = set(
-    [
+STOPWORDS = frozenset(
+    {
         "the",
         "and",
         "is",
@@ -58,8 +60,6 @@ STOPWORDS = set(
         "its",
         "can't",
         "dont",
-        "can't",
-        "can't",
         "do",
         "did",
         "didn't",
@@ -69,41 +69,31 @@ STOPWORDS = set(
         "lol",
         "haha",
         "hahaha",
-    ]
+    }
 )
 
 
 def message_counts(messages: Iterable[Message]) -> Dict[str, int]:
     """Return a dict of sender -> number of messages sent."""
-    counts = Counter()
-    for msg in messages:
-        counts[msg.sender] += 1
+    counts = Counter(msg.sender for msg in messages)
     return dict(counts)
 
 
 def messages_by_day(messages: Iterable[Message]) -> Dict[str, int]:
     """Return a dict of YYYY‑MM‑DD -> message count."""
-    counts = Counter()
-    for msg in messages:
-        key = msg.timestamp.strftime("%Y-%m-%d")
-        counts[key] += 1
-    return dict(counts)
+    # Bucket by ordinal day and only format the (few) distinct days.
+    counts = Counter(msg.timestamp.toordinal() for msg in messages)
+    return {date.fromordinal(day).isoformat(): n for day, n in counts.items()}
 
 
-def messages_by_hour(messages: Iterable[Message]) -> Dict[int, int]:
-    """Return a dict of hour (0-23) -> message count."""
-    counts = Counter()
-    for msg in messages:
-        counts[msg.timestamp.hour] += 1
-    return dict(counts)
+def messages_by_hour(messages: Iterable[Message]) -> Counter[int]:
+    """Return a Counter of hour (0-23) -> message count."""
+    return Counter(msg.timestamp.hour for msg in messages)
 
 
-def messages_by_weekday(messages: Iterable[Message]) -> Dict[int, int]:
-    """Return a dict of weekday (0=Monday) -> message count."""
-    counts = Counter()
-    for msg in messages:
-        counts[msg.timestamp.weekday()] += 1
-    return dict(counts)
+def messages_by_weekday(messages: Iterable[Message]) -> Counter[int]:
+    """Return a Counter of weekday (0=Monday) -> message count."""
+    return Counter(msg.timestamp.weekday() for msg in messages)
 
 
 _WORD_RE = re.compile(r"\b\w+\b", re.UNICODE)
@@ -111,41 +101,103 @@ _WORD_RE = re.compile(r"\b\w+\b", re.UNICODE)
 
 def extract_words(text: str) -> List[str]:
     """Extract a list of lowercase words from a text string."""
-    words = _WORD_RE.findall(text.lower())
-    return [w for w in words if w and w not in STOPWORDS and len(w) > 1]
+    # Lowercase each token rather than the whole message so the text is not
+    # copied before scanning.
+    return [
+        lw
+        for w in _WORD_RE.findall(text)
+        if len(w) > 1 and (lw := w.lower()) not in STOPWORDS
+    ]
 
 
 def top_words(messages: Iterable[Message], n: int = 10) -> List[Tuple[str, int]]:
     """Return the top `n` most common non‑stop words across all messages."""
-    counter = Counter()
-    for msg in messages:
-        for word in extract_words(msg.text):
-            counter[word] += 1
+    texts = (msg.text for msg in messages)
+    counter = Counter(chain.from_iterable(map(extract_words, texts)))
     return counter.most_common(n)
 
 
+# Matches one emoji at a time.  A flag is a pair of regional indicator
+# symbols and a skin tone modifier belongs to the emoji before it, so both are
+# kept together with their base instead of being counted as separate emojis.
+# The pattern starts with a plain character class so the regex engine can
+# still scan quickly for candidate characters.
 _EMOJI_PATTERN = re.compile(
     "["
     "\U0001F600-\U0001F64F"  # emoticons
-    "\U0001F300-\U0001F5FF"  # symbols & pictographs
+    "\U0001F300-\U0001F3FA"  # symbols & pictographs (up to the skin tones)
+    "\U0001F400-\U0001F5FF"  # symbols & pictographs (after the skin tones)
     "\U0001F680-\U0001F6FF"  # transport & map symbols
     "\U0001F1E0-\U0001F1FF"  # flags (iOS)
     "\U00002700-\U000027BF"  # Dingbats
     "\U0001F900-\U0001F9FF"  # Supplemental Symbols and Pictographs
-    "]+",
+    "]"
+    "(?:"
+    "(?<=[\U0001F1E6-\U0001F1FF])[\U0001F1E6-\U0001F1FF]"  # second flag letter
+    "|[\U0001F3FB-\U0001F3FF]"  # skin tone modifier
+    ")?",
     flags=re.UNICODE,
 )
 
 
 def extract_emojis(text: str) -> List[str]:
-    """Return a list of emoji characters found in the text."""
+    """Return a list of emojis found in the text, one entry per emoji."""
+    # Every emoji range lies outside ASCII, so plain-text messages (the vast
+    # majority) can skip the regex scan altogether.
+    if text.isascii():
+        return []
     return _EMOJI_PATTERN.findall(text)
 
 
 def top_emojis(messages: Iterable[Message], n: int = 5) -> List[Tuple[str, int]]:
     """Return the top `n` most common emojis across all messages."""
-    counter = Counter()
+    texts = (msg.text for msg in messages)
+    counter = Counter(chain.from_iterable(map(extract_emojis, texts)))
+    return counter.most_common(n)
+
+
+@dataclass
+class ChatStats:
+    """All per-chat aggregates, computed together by `aggregate_stats`."""
+
+    sender_counts: Counter = field(default_factory=Counter)
+    day_counts: Counter = field(default_factory=Counter)
+    hour_counts: Counter = field(default_factory=Counter)
+    weekday_counts: Counter = field(default_factory=Counter)
+    word_counts: Counter = field(default_factory=Counter)
+    emoji_counts: Counter = field(default_factory=Counter)
+
+
+def aggregate_stats(messages: Iterable[Message]) -> ChatStats:
+    """Compute every statistic in a single pass over the messages.
+
+    This is equivalent to calling `message_counts`, `messages_by_day`,
+    `messages_by_hour`, `messages_by_weekday`, `top_words` and `top_emojis`
+    separately, but walks the messages only once and never holds on to them,
+    so a generator of messages is consumed without being copied.
+    """
+    stats = ChatStats()
+    sender_counts = stats.sender_counts
+    word_counts = stats.word_counts
+    emoji_counts = stats.emoji_counts
+    # Joint histogram keyed by ``ordinal_day * 24 + hour``: one update per
+    # message covers the day, hour and weekday statistics.
+    slot_counts: Counter = Counter()
     for msg in messages:
-        for emoji_char in extract_emojis(msg.text):
-            counter[emoji_char] += 1
-    return counter.most_common(n)
\ No newline at end of file
+        ts = msg.timestamp
+        text = msg.text
+        sender_counts[msg.sender] += 1
+        slot_counts[ts.toordinal() * 24 + ts.hour] += 1
+        word_counts.update(extract_words(text))
+        emoji_counts.update(extract_emojis(text))
+    ordinal_counts: Counter = Counter()
+    for slot, n in slot_counts.items():
+        day, hour = divmod(slot, 24)
+        ordinal_counts[day] += n
+        stats.hour_counts[hour] += n
+    # Day labels and weekdays are derived per distinct day rather than per
+    # message.  Ordinal 1 (0001-01-01) is a Monday.
+    for day, n in ordinal_counts.items():
+        stats.day_counts[date.fromordinal(day).isoformat()] = n
+        stats.weekday_counts[(day - 1) % 7] += n
+    return stats
@@ -14,17 +14,12 @@ are supported:
 """
 from __future__ import annotations
 
-from typing import Iterable, List, Tuple
+from operator import itemgetter
+from typing import Iterable, List, Optional, Tuple
 import math
 
 from whatsapp_parser import Message
-from analysis_utils import (
-    message_counts,
-    messages_by_hour,
-    messages_by_weekday,
-    top_emojis,
-    top_words,
-)
+from analysis_utils import ChatStats, aggregate_stats
 
 
 _WEEKDAY_NAMES = {
@@ -38,6 +33,30 @@ _WEEKDAY_NAMES = {
 }
 
 
+# Roast lines keyed by (level, topic), filled in with `str.format`.
+_TEMPLATES = {
+    # Talkative and quiet participants
+    ("mild", "top_sender"): "{name} sent the most messages at {pct}% of the chat. Quite the social butterfly!",
+    ("medium", "top_sender"): "{name} dominated the chat with {pct}% of the messages. Maybe let someone else get a word in?",
+    ("savage", "top_sender"): "{name} hogged {pct}% of the conversation. Ever heard of a hobby outside this chat?",
+    ("mild", "bottom_sender"): "{name} only contributed {pct}% of messages. Lurking is an art form, after all.",
+    ("medium", "bottom_sender"): "{name} clocked in at just {pct}% of messages. Do you even know this chat exists?",
+    ("savage", "bottom_sender"): "{name} barely registered at {pct}% of messages. Silent member or professional ghoster?",
+    # Peak activity time
+    ("mild", "peak_time"): "Most chatting happens around {hour} on {weekday}. Night owls with a schedule, perhaps?",
+    ("medium", "peak_time"): "Peak chat time is {hour} on {weekday}. Who needs sleep when you have memes?",
+    ("savage", "peak_time"): "You lot blow up the chat at {hour} on {weekday}. Congratulations on never respecting bed time.",
+    # Favourite emoji
+    ("mild", "emoji"): "Your favourite emoji appears to be {emoji}, used {count} times. Expressive bunch!",
+    ("medium", "emoji"): "Top emoji award goes to {emoji} – dropped {count} times. Maybe diversify your feelings?",
+    ("savage", "emoji"): "{emoji} shows up {count} times. Ever considered using words like a normal human?",
+    # Most common word
+    ("mild", "word"): "The word '{word}' comes up a lot ({count} times). Looks like a favourite topic!",
+    ("medium", "word"): "You say '{word}' {count} times. Is that a cry for help or just laziness?",
+    ("savage", "word"): "'{word}' appears {count} times. We get it, you have a limited vocabulary.",
+}
+
+
 def _percentage(part: int, whole: int) -> int:
     return int(round(part / whole * 100)) if whole else 0
 
@@ -51,110 +70,62 @@ def _format_hour(hour: int) -> str:
     return f"{h}{suffix}"
 
 
-def generate_roast(messages: Iterable[Message], level: str = "medium") -> str:
+def generate_roast(
+    messages: Iterable[Message],
+    level: str = "medium",
+    stats: Optional[ChatStats] = None,
+) -> str:
     """Generate a roast paragraph based on the chat messages.
 
-    :param messages: An iterable of Message objects
+    :param messages: An iterable of Message objects; it is consumed once
     :param level: 'mild', 'medium' or 'savage'
+    :param stats: Pre-computed `ChatStats` for ``messages``; computed here if
+        omitted
     :return: A multi‑line string with witty commentary
     """
     level = level.lower()
     if level not in {"mild", "medium", "savage"}:
         level = "medium"
 
-    msgs = list(messages)
-    total_messages = len(msgs)
+    # All figures below come from the aggregates, so the messages are only
+    # walked once (and not at all when stats are supplied).
+    if stats is None:
+        stats = aggregate_stats(messages)
+
+    counts = stats.sender_counts
+    total_messages = sum(counts.values())
     if total_messages == 0:
         return "No messages to roast."
 
-    counts = message_counts(msgs)
     # Determine talkative vs silent participants
-    sorted_counts = sorted(counts.items(), key=lambda x: x[1], reverse=True)
+    sorted_counts = sorted(counts.items(), key=itemgetter(1), reverse=True)
     top_sender, top_count = sorted_counts[0]
     top_pct = _percentage(top_count, total_messages)
     bottom_sender, bottom_count = sorted_counts[-1]
     bottom_pct = _percentage(bottom_count, total_messages)
 
-    hour_counts = messages_by_hour(msgs)
-    peak_hour = max(hour_counts.items(), key=lambda x: x[1])[0]
-    weekday_counts = messages_by_weekday(msgs)
-    peak_weekday = max(weekday_counts.items(), key=lambda x: x[1])[0]
+    hour_counts = stats.hour_counts
+    peak_hour = hour_counts.most_common(1)[0][0]
+    weekday_counts = stats.weekday_counts
+    peak_weekday = weekday_counts.most_common(1)[0][0]
 
-    emojis = top_emojis(msgs, n=1)
+    emojis = stats.emoji_counts.most_common(1)
     top_emoji, emoji_count = (emojis[0] if emojis else (None, 0))
 
-    words = top_words(msgs, n=1)
+    words = stats.word_counts.most_common(1)
     top_word, word_count = (words[0] if words else (None, 0))
 
-    lines: List[str] = []
-
-    # Template for talkative user
-    if level == "mild":
-        lines.append(
-            f"{top_sender} sent the most messages at {top_pct}% of the chat. Quite the social butterfly!"
-        )
-        lines.append(
-            f"{bottom_sender} only contributed {bottom_pct}% of messages. Lurking is an art form, after all."
-        )
-    elif level == "medium":
-        lines.append(
-            f"{top_sender} dominated the chat with {top_pct}% of the messages. Maybe let someone else get a word in?"
-        )
-        lines.append(
-            f"{bottom_sender} clocked in at just {bottom_pct}% of messages. Do you even know this chat exists?"
-        )
-    else:  # savage
-        lines.append(
-            f"{top_sender} hogged {top_pct}% of the conversation. Ever heard of a hobby outside this chat?"
-        )
-        lines.append(
-            f"{bottom_sender} barely registered at {bottom_pct}% of messages. Silent member or professional ghoster?"
-        )
-
-    # Template for peak activity time
-    peak_hour_str = _format_hour(peak_hour)
-    weekday_name = _WEEKDAY_NAMES.get(peak_weekday, "Unknown day")
-    if level == "mild":
-        lines.append(
-            f"Most chatting happens around {peak_hour_str} on {weekday_name}. Night owls with a schedule, perhaps?"
-        )
-    elif level == "medium":
-        lines.append(
-            f"Peak chat time is {peak_hour_str} on {weekday_name}. Who needs sleep when you have memes?"
-        )
-    else:
-        lines.append(
-            f"You lot blow up the chat at {peak_hour_str} on {weekday_name}. Congratulations on never respecting bed time."
-        )
-
-    # Template for favourite emoji
+    lines: List[str] = [
+        _TEMPLATES[level, "top_sender"].format(name=top_sender, pct=top_pct),
+        _TEMPLATES[level, "bottom_sender"].format(name=bottom_sender, pct=bottom_pct),
+        _TEMPLATES[level, "peak_time"].format(
+            hour=_format_hour(peak_hour),
+            weekday=_WEEKDAY_NAMES.get(peak_weekday, "Unknown day"),
+        ),
+    ]
     if top_emoji:
-        if level == "mild":
-            lines.append(
-                f"Your favourite emoji appears to be {top_emoji}, used {emoji_count} times. Expressive bunch!"
-            )
-        elif level == "medium":
-            lines.append(
-                f"Top emoji award goes to {top_emoji} – dropped {emoji_count} times. Maybe diversify your feelings?"
-            )
-        else:
-            lines.append(
-                f"{top_emoji} shows up {emoji_count} times. Ever considered using words like a normal human?"
-            )
-
-    # Template for most common word
+        lines.append(_TEMPLATES[level, "emoji"].format(emoji=top_emoji, count=emoji_count))
     if top_word:
-        if level == "mild":
-            lines.append(
-                f"The word '{top_word}' comes up a lot ({word_count} times). Looks like a favourite topic!"
-            )
-        elif level == "medium":
-            lines.append(
-                f"You say '{top_word}' {word_count} times. Is that a cry for help or just laziness?"
-            )
-        else:
-            lines.append(
-                f"'{top_word}' appears {word_count} times. We get it, you have a limited vocabulary."
-            )
+        lines.append(_TEMPLATES[level, "word"].format(word=top_word, count=word_count))
 
     return "\n".join(lines)
\ No newline at end of file
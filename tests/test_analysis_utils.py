@@ -0,0 +1,16 @@
+import pytest
+
+from analysis_utils import extract_emojis
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("🇺🇸🇬🇧", ["🇺🇸", "🇬🇧"]),
+        ("😂🇺🇸", ["😂", "🇺🇸"]),
+        ("✌🏽", ["✌🏽"]),
+        ("🏽", []),
+    ],
+)
+def test_extract_emojis_keeps_flags_and_skin_tones_together(text, expected):
+    assert extract_emojis(text) == expected
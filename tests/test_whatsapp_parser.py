@@ -0,0 +1,116 @@
+import os
+import threading
+from datetime import datetime
+
+import pytest
+
+import whatsapp_parser
+from whatsapp_parser import Message, parse_chat, parse_chat_cached
+
+CHAT = (
+    "Messages and calls are end-to-end encrypted.\n"
+    "12/30/24, 9:15 PM - Alice: Hey everyone!\n"
+    "12/30/24, 9:16 PM - Bob: This message\n"
+    "spans several\n"
+    "\n"
+    "lines 😂\n"
+    "12/31/24, 10:00 AM - Charlie: Good morning ☀️\r\n"
+    "12/31/24, 12:05 AM - Alice: Morning ☕️\r\n"
+    "continued with CRLF\r\n"
+    "1/1/2025, 23:59 - Dave: Happy New Year! 🎉🎉\n"
+) * 20
+
+
+@pytest.fixture
+def chat_file(tmp_path):
+    path = tmp_path / "chat.txt"
+    path.write_bytes(CHAT.encode("utf-8"))
+    return path
+
+
+def test_parse_chat_handles_continuations(chat_file):
+    messages = parse_chat(str(chat_file))
+    assert len(messages) == 5 * 20
+    assert messages[0] == Message(datetime(2024, 12, 30, 21, 15), "Alice", "Hey everyone!")
+    assert messages[1].text == "This message\nspans several\nlines 😂"
+    assert messages[3].timestamp == datetime(2024, 12, 31, 0, 5)
+    assert messages[3].text == "Morning ☕️\ncontinued with CRLF"
+    # The preamble of the next repetition continues Dave's message
+    assert messages[4].text == "Happy New Year! 🎉🎉\nMessages and calls are end-to-end encrypted."
+
+
+def test_parse_chat_reads_non_seekable_input(chat_file, tmp_path):
+    fifo = tmp_path / "chat.fifo"
+    os.mkfifo(fifo)
+
+    def feed():
+        with open(fifo, "wb") as f:
+            f.write(chat_file.read_bytes())
+
+    writer = threading.Thread(target=feed)
+    writer.start()
+    try:
+        messages = parse_chat(str(fifo))
+    finally:
+        writer.join()
+    assert messages == parse_chat(str(chat_file))
+
+
+def test_parse_chat_accepts_cr_line_endings(tmp_path):
+    path = tmp_path / "chat.txt"
+    path.write_bytes(
+        "12/30/24, 9:15 PM - Alice: Hey\rsecond line\r12/30/24, 9:16 PM - Bob: Hello\r".encode("utf-8")
+    )
+    assert parse_chat(str(path)) == [
+        Message(datetime(2024, 12, 30, 21, 15), "Alice", "Hey\nsecond line"),
+        Message(datetime(2024, 12, 30, 21, 16), "Bob", "Hello"),
+    ]
+
+
+def test_parse_chat_cached_writes_entry_on_miss(chat_file, tmp_path):
+    cache_dir = tmp_path / "cache"
+    messages = parse_chat_cached(str(chat_file), cache_dir=str(cache_dir))
+    assert messages == parse_chat(str(chat_file))
+    assert [p.name.endswith("-v1.pickle") for p in cache_dir.iterdir()] == [True]
+
+
+def test_parse_chat_cached_reuses_entry_on_hit(chat_file, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    first = parse_chat_cached(str(chat_file), cache_dir=str(cache_dir))
+
+    def fail(file_path):
+        raise AssertionError("cache hit should not re-parse")
+
+    monkeypatch.setattr(whatsapp_parser, "parse_chat", fail)
+    assert parse_chat_cached(str(chat_file), cache_dir=str(cache_dir)) == first
+
+
+def test_parse_chat_cached_replaces_corrupt_entry(chat_file, tmp_path):
+    cache_dir = tmp_path / "cache"
+    parse_chat_cached(str(chat_file), cache_dir=str(cache_dir))
+    (entry,) = cache_dir.iterdir()
+    entry.write_bytes(b"not a pickle")
+    assert parse_chat_cached(str(chat_file), cache_dir=str(cache_dir)) == parse_chat(str(chat_file))
+    assert list(cache_dir.iterdir()) == [entry]
+    assert entry.read_bytes() != b"not a pickle"
+
+
+def test_parse_chat_cached_survives_unwritable_cache(chat_file, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+
+    def refuse(src, dst):
+        raise PermissionError(dst)
+
+    # chmod does not stop root, so fail the final rename instead
+    monkeypatch.setattr(whatsapp_parser.os, "replace", refuse)
+    assert parse_chat_cached(str(chat_file), cache_dir=str(cache_dir)) == parse_chat(str(chat_file))
+    assert list(cache_dir.iterdir()) == []
+
+
+def test_parse_chat_cached_ignores_cache_dir_under_a_file(chat_file, tmp_path):
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    messages = parse_chat_cached(str(chat_file), cache_dir=str(blocker / "cache"))
+    assert messages == parse_chat(str(chat_file))
+    assert set(tmp_path.iterdir()) == {chat_file, blocker}
@@ -1,9 +1,10 @@
 """
 Parser for exported WhatsApp chats.
 
-This module exposes a single function, `parse_chat`, which accepts the path
-to a WhatsApp text export.  It returns a list of message dictionaries with
-`timestamp`, `sender` and `text` keys.
+This module exposes `parse_chat`, which accepts the path to a WhatsApp text
+export.  It returns a list of `Message` objects with `timestamp`, `sender`
+and `text` attributes.  `parse_chat_cached` does the same but keeps the
+parsed result on disk so repeated runs over the same export skip parsing.
 
 The parser supports the standard English export format:
 
@@ -20,79 +21,159 @@ time), you may need to adjust the regular expression and datetime parsing.
 """
 from __future__ import annotations
 
+import hashlib
+import os
+import pickle
 import re
+import sys
+import tempfile
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Optional
 
 # Regular expression to match the beginning of a WhatsApp message.
 _MESSAGE_RE = re.compile(
     r"^(?P<date>\d{1,2}/\d{1,2}/\d{2,4}),\s*(?P<time>\d{1,2}:\d{2})\s*(?P<ampm>AM|PM)?\s*\-\s*(?P<sender>[^:]+):\s*(?P<text>.*)$"
 )
 
+# Part of every cache file name used by `parse_chat_cached`.  Bump it whenever
+# `Message` or the parsing rules change so that stale entries are ignored.
+_CACHE_VERSION = 1
+
 
 @dataclass
 class Message:
+    """A single chat message.
+
+    Slotted so that large chats do not pay for a ``__dict__`` per message.
+    The slots are declared by hand rather than with ``dataclass(slots=True)``
+    so that Python versions before 3.10 are still supported.
+    """
+
+    __slots__ = ("timestamp", "sender", "text")
+
     timestamp: datetime
     sender: str
     text: str
 
 
+@lru_cache(maxsize=65536)
 def _parse_timestamp(date_str: str, time_str: str, ampm: Optional[str]) -> datetime:
     """Parse date and time strings into a datetime object.
 
     The function expects US style dates (month/day/year).  The year can be
     two or four digits.  If a year has two digits it is interpreted as
     2000+year (e.g. 24 -> 2024).  The time can be given with or without AM/PM.
+
+    The fields are converted arithmetically rather than via `strptime`, and
+    results are cached because many messages share the same minute.
     """
-    # Normalise two‑digit years by prepending 20
-    parts = date_str.split("/")
-    month, day, year = parts
+    month, day, year = date_str.split("/")
+    year_num = int(year)
     if len(year) == 2:
-        year = "20" + year
-    date_fmt = "%m/%d/%Y"
-    if ampm:
-        fmt = f"{date_fmt}, %I:%M %p"
-        dt_str = f"{month}/{day}/{year}, {time_str} {ampm}"
-    else:
-        fmt = f"{date_fmt}, %H:%M"
-        dt_str = f"{month}/{day}/{year}, {time_str}"
-    return datetime.strptime(dt_str, fmt)
+        year_num += 2000
+    hour_str, minute_str = time_str.split(":")
+    hour = int(hour_str)
+    if ampm == "PM" and hour != 12:
+        hour += 12
+    elif ampm == "AM" and hour == 12:
+        hour = 0
+    return datetime(year_num, int(month), int(day), hour, int(minute_str))
 
 
-def parse_chat(file_path: str) -> List[Message]:
-    """Parse a WhatsApp chat export and return a list of Message objects.
+def _parse_lines(lines: Iterable[str]) -> List[Message]:
+    """Parse decoded lines into Message objects.
 
-    Lines that do not match the message pattern are treated as continuations
-    of the previous message.  Empty lines are ignored.
+    Lines before the first message start are skipped.
     """
     messages: List[Message] = []
     current_msg: Optional[Message] = None
-    with open(file_path, "r", encoding="utf-8") as f:
-        for raw_line in f:
-            line = raw_line.strip("\n")
-            if not line:
-                continue
-            m = _MESSAGE_RE.match(line)
-            if m:
-                # Save previous message before starting a new one
-                if current_msg is not None:
-                    messages.append(current_msg)
-                date_str = m.group("date")
-                time_str = m.group("time")
-                ampm = m.group("ampm")
-                sender = m.group("sender").strip()
-                text = m.group("text")
-                timestamp = _parse_timestamp(date_str, time_str, ampm)
-                current_msg = Message(timestamp=timestamp, sender=sender, text=text)
-            else:
-                # Continuation of previous message
-                if current_msg is not None:
-                    current_msg.text += "\n" + line
-                else:
-                    # Skip lines that appear before the first message
-                    continue
+    for line in lines:
+        if not line:
+            continue
+        # Message headers start with the date, so any line that does not
+        # start with a digit is a continuation and can skip the regex.
+        m = _MESSAGE_RE.match(line) if line[0].isdigit() else None
+        if m:
+            # Save previous message before starting a new one
+            if current_msg is not None:
+                messages.append(current_msg)
+            # One groups() call is markedly cheaper than a group() per field
+            date_str, time_str, ampm, sender, text = m.groups()
+            # Chats have few distinct senders; interning makes every message
+            # from the same person share one string object.
+            sender = sys.intern(sender.strip())
+            timestamp = _parse_timestamp(date_str, time_str, ampm)
+            current_msg = Message(timestamp=timestamp, sender=sender, text=text)
+        elif current_msg is not None:
+            # Continuation of previous message
+            current_msg.text += "\n" + line
     # Append the last message
     if current_msg is not None:
         messages.append(current_msg)
-    return messages
\ No newline at end of file
+    return messages
+
+
+def parse_chat(file_path: str) -> List[Message]:
+    """Parse a WhatsApp chat export and return a list of Message objects.
+
+    Lines that do not match the message pattern are treated as continuations
+    of the previous message.  Empty lines are ignored.
+    """
+    # Stream the file in text mode.  This also works for pipes and other
+    # non-seekable inputs, and universal newlines accept \n, \r\n and bare \r
+    # line endings.
+    with open(file_path, "r", encoding="utf-8") as f:
+        return _parse_lines(raw_line.rstrip("\n") for raw_line in f)
+
+
+def default_cache_dir() -> Path:
+    """Return the directory used to cache parsed chats."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "chat_roast"
+
+
+def parse_chat_cached(file_path: str, cache_dir: Optional[str] = None) -> List[Message]:
+    """Like `parse_chat`, but reuse the result of parsing identical content.
+
+    Parsed messages are pickled under ``cache_dir`` (default
+    ``$XDG_CACHE_HOME/chat_roast``, falling back to ``~/.cache/chat_roast``)
+    keyed by a SHA-256 of the file contents, so re-running on an unchanged
+    export only costs reading and hashing the file.  A cache that cannot be
+    read or written is ignored and the file is parsed normally.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    cache_root = Path(cache_dir) if cache_dir else default_cache_dir()
+    cache_path = cache_root / f"{digest.hexdigest()[:16]}-v{_CACHE_VERSION}.pickle"
+
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        # Missing, unreadable or corrupt entry (unpickling garbage can raise
+        # almost anything); it is (re)written below
+        pass
+
+    messages = parse_chat(file_path)
+    tmp_name: Optional[str] = None
+    try:
+        cache_root.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so a concurrent reader never sees a
+        # partially written cache entry.
+        with tempfile.NamedTemporaryFile(dir=cache_root, delete=False) as tmp:
+            tmp_name = tmp.name
+            pickle.dump(messages, tmp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, cache_path)
+    except OSError:
+        # Caching is best effort, but do not leave a partial entry behind
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+    return messages